@@ -10,17 +10,69 @@ Fixes:
 - Preserve per-cell raw inner HTML under _html (lists, SVG, anchors).
 - Preserve per-cell links under _links [{text, href}].
 - Normalise "Aural UI" header to "AURAL UI".
+
+Tables are parsed with lxml when it is installed, otherwise with the stdlib
+HTMLParser. Set HTML_PARSER=html.parser to force the stdlib parser.
+JSON is serialised with orjson when it is installed (same output as json).
+The sibling .json is pretty-printed for diffing; PRETTY_JSON=0 writes it
+compact, reusing the payload already serialised for the template.
+EMIT_RICH_CELLS=0 leaves out the per-cell _html/_links maps (the lookup then
+renders plain cell text), which shrinks the bundle considerably.
+BUNDLE_CACHE=<path> keeps parsed sections in a JSON file keyed by a hash of
+each source file (plus this script, the settings above and the parser's
+version), so unchanged tables are not parsed again.
 """
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from html.parser import HTMLParser
-from html import unescape
+from html import escape
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+import hashlib
 import json
 import os
+import platform
 import re
 import sys
 
+try:
+    import lxml
+    from lxml import etree as lxml_etree, html as lxml_html
+except ImportError:  # optional; fall back to the stdlib HTMLParser grabber
+    lxml_html = None
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
+
+
+# ---------- Constants ----------
+
+_WS_RE = re.compile(r"\s+")
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+# ASCII control characters other than \t \n \r (they break JSON.parse)
+_CTRL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+# Opening tag of the template's JSON <script id="data"> (or id="html-support-data");
+# only the tag is matched, the payload ends at the next _SCRIPT_CLOSE_RE
+# (bytes: the template is spliced without being decoded)
+_DATA_SCRIPT_OPEN_RE = re.compile(
+    rb'<script[^>]*id=["\'](?:data|html-support-data)["\'][^>]*>',
+    re.IGNORECASE,
+)
+_SCRIPT_CLOSE_RE = re.compile(rb"</script>", re.IGNORECASE)
+# Below this many output bytes the files are simply written one after another
+_PARALLEL_WRITE_MIN = 256 * 1024
+
+# Stable display names for the first column, keyed by lowercased file name
+_SR_NAME_MAPPING = {
+    "jaws.html": "JAWS",
+    "nvda.html": "NVDA",
+    "talkback-android.html": "TalkBack on Android",
+    "vo-mac.html": "VoiceOver on Mac",
+    "vo-ios.html": "VoiceOver on iOS",
+}
+
 
 # ---------- Utilities ----------
 
@@ -32,12 +84,25 @@ def clean_text(s: str) -> str:
     """Remove disallowed control chars (ASCII < 0x20) except \t \n \r."""
     if not isinstance(s, str):
         s = "" if s is None else str(s)
-    return "".join(ch for ch in s if (ord(ch) >= 0x20) or ch in "\t\n\r")
+    return _CTRL_RE.sub("", s)
 
 def clean_html(s: str) -> str:
     """Same sanitisation for innerHTML strings (keep markup, drop bad controls)."""
     return clean_text(s)
 
+def normalize_cell_text(text: str) -> str:
+    """Strip each line of a cell's text and drop the blank ones."""
+    # map/filter keep the per-line loop in C
+    return clean_text("\n".join(filter(None, map(str.strip, text.splitlines()))))
+
+def read_html(p: Path) -> str:
+    """Decode as UTF-8 in one go; only drop undecodable bytes if that fails."""
+    data = p.read_bytes()
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("utf-8", errors="ignore")
+
 def get_env_list(name: str) -> list[Path]:
     raw = os.environ.get(name, "").strip()
     if not raw:
@@ -61,7 +126,7 @@ def get_env_output_path() -> Path:
     val = os.environ.get("OUTPUT_FILE", "").strip()
     if not val:
         base = (os.environ.get("OUTPUT_BASENAME") or "lookup.auto").strip() or "lookup.auto"
-        ts = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
         val = f"lookup/{base}.{ts}.html"
         print(f"OUTPUT_FILE not set; defaulting to {val}")
     p = Path(val)
@@ -80,9 +145,17 @@ class TableGrabber(HTMLParser):
     For each cell we capture: (text, innerHTML, links[]).
     """
     def __init__(self):
-        super().__init__(convert_charrefs=False)
+        # character references arrive already decoded in handle_data
+        super().__init__(convert_charrefs=True)  # calls reset()
+
+    def reset(self):
+        # tokenizer state and our own, so one instance can parse several files
+        super().reset()
         self.reset_state()
 
+    def feed_file(self, path: Path):
+        self.feed(read_html(path))
+
     def reset_state(self):
         self.in_table = False
         self.table_seen = False
@@ -102,6 +175,12 @@ class TableGrabber(HTMLParser):
         self.in_cell = False
         self.cell_text = []
         self.cell_html = []
+        self.cell_links = []
+        self.cell_has_markup = False  # cell_html is only kept once a child tag shows up
+
+        self.in_anchor = False
+        self.anchor_href = ""
+        self.anchor_text = []
 
         self.header_candidates = []  # list[list[(text, html, links)]]
         self.data_rows = []          # list[list[(text, html, links)]]
@@ -124,9 +203,12 @@ class TableGrabber(HTMLParser):
             self.tr_has_td = False
 
         elif self.in_tr and tag in ("td", "th"):
+            # fresh buffers are allocated here only; closing tags just flip
+            # the state flags (cell_html is created by start_cell_markup)
             self.in_cell = True
             self.cell_text = []
-            self.cell_html = []
+            self.cell_links = []
+            self.cell_has_markup = False
             if tag == "th":
                 self.tr_has_th = True
             if tag == "td":
@@ -139,13 +221,26 @@ class TableGrabber(HTMLParser):
                     self.caption_links.append(v)
                     break
 
+        # cell links (captured live rather than re-scanning the cell HTML)
+        if self.in_cell and tag == "a":
+            for k, v in attrs:
+                if (k or "").lower() == "href" and v is not None:
+                    self.in_anchor = True
+                    self.anchor_href = v
+                    self.anchor_text = []
+                    break
+
         # record inner HTML (not wrapping td/th)
         if self.in_cell and tag not in ("td", "th"):
-            attrs_str = "".join([f' {k}="{v}"' for k, v in attrs if v is not None])
+            self.start_cell_markup()
             if tag == "br":
                 self.cell_html.append("<br>")
-            else:
+            elif attrs:
+                attrs_str = "".join([f' {k}="{v}"' for k, v in attrs if v is not None])
                 self.cell_html.append(f"<{tag}{attrs_str}>")
+            else:
+                # most inline tags (<code>, <kbd>, <li>…) carry no attributes
+                self.cell_html.append(f"<{tag}>")
 
     def handle_endtag(self, tag):
         if tag == "caption" and self.in_caption:
@@ -155,27 +250,21 @@ class TableGrabber(HTMLParser):
             self.in_thead = False
 
         elif tag in ("td", "th") and self.in_cell:
-            text = unescape("".join(self.cell_text))
-            lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-            text_norm = "\n".join(lines)
-            text_norm = clean_text(text_norm)  # <-- sanitise
-            cell_html = clean_html("".join(self.cell_html))  # <-- sanitise
-
-            # collect links from the html we built (support both " and ' quotes)
-            links = []
-            for m in re.finditer(
-                r'<a\b[^>]*href=(["\'])(.*?)\1[^>]*>(.*?)</a>',
-                cell_html,
-                flags=re.I | re.S,
-            ):
-                href = clean_text(m.group(2))
-                label = clean_text(re.sub(r"\s+", " ", unescape(m.group(3))).strip())
-                links.append({"href": href, "text": label})
-
-            self.tr_cells.append((text_norm, cell_html, links))
+            raw_text = "".join(self.cell_text)
+            text_norm = normalize_cell_text(raw_text)  # <-- sanitise
+            # a plain-text cell's inner HTML is just its (re-escaped) text
+            cell_html = clean_html("".join(self.cell_html) if self.cell_has_markup else escape(raw_text, quote=False))  # <-- sanitise
+
+            self.tr_cells.append((text_norm, cell_html, self.cell_links))
             self.in_cell = False
-            self.cell_text = []
-            self.cell_html = []
+            self.in_anchor = False
+            self.cell_has_markup = False
+
+        elif tag == "a" and self.in_anchor:
+            label = " ".join("".join(self.anchor_text).split())
+            self.cell_links.append({"text": clean_text(label), "href": clean_text(self.anchor_href)})
+            self.in_anchor = False
+            self.anchor_href = ""
 
         elif tag == "tr" and self.in_tr:
             if self.tr_cells:
@@ -185,7 +274,6 @@ class TableGrabber(HTMLParser):
                 else:
                     self.data_rows.append(self.tr_cells)
             self.in_tr = False
-            self.tr_cells = []
             self.tr_has_th = False
             self.tr_has_td = False
 
@@ -194,29 +282,126 @@ class TableGrabber(HTMLParser):
 
         # generic closing for inner HTML (we already added open tag in start)
         if self.in_cell and tag not in ("td", "th", "br"):
+            self.start_cell_markup()
             self.cell_html.append(f"</{tag}>")
 
+    def start_cell_markup(self):
+        # plain text so far: seed the inner HTML with it
+        if not self.cell_has_markup:
+            self.cell_has_markup = True
+            self.cell_html = [escape(t, quote=False) for t in self.cell_text]
+
     def handle_data(self, data):
         if self.in_cell:
             self.cell_text.append(data)
-            self.cell_html.append(data)
+            if self.cell_has_markup:
+                self.cell_html.append(escape(data, quote=False))
+        if self.in_anchor:
+            self.anchor_text.append(data)
         if self.in_caption:
             self.caption_text.append(data)
 
 
+class LxmlTableGrabber:
+    """
+    Same extraction as TableGrabber, but the document is parsed by lxml
+    (libxml2) and the first table is walked as a tree. Exposes the same
+    caption_text / caption_links / thead_rows / header_candidates / data_rows.
+    """
+    def __init__(self):
+        # The source pages are UTF-8; decoding happens inside libxml2
+        self.parser = lxml_html.HTMLParser(encoding="utf-8")
+        self.reset()
+
+    def reset(self):
+        self.reset_state()
+
+    def reset_state(self):
+        self.caption_text = []
+        self.caption_links = []
+        self.thead_rows = []         # list[list[(text, html, links)]]
+        self.header_candidates = []  # list[list[(text, html, links)]]
+        self.data_rows = []          # list[list[(text, html, links)]]
+
+    def feed_file(self, path: Path):
+        # hand libxml2 the raw bytes rather than a decoded str
+        self.feed(path.read_bytes())
+
+    def feed(self, data):
+        try:
+            doc = lxml_html.document_fromstring(data, parser=self.parser)
+        except lxml_etree.ParserError:
+            # empty/whitespace-only input: no rows, so convert() reports it
+            return
+        table = doc.find(".//table")
+        if table is None:
+            return
+
+        caption = table.find("caption")
+        if caption is not None:
+            self.caption_text.append(caption.text_content())
+            for a in caption.iter("a"):
+                href = a.get("href")
+                if href:
+                    self.caption_links.append(href)
+
+        for tr in table.iter("tr"):
+            cells = [c for c in tr if c.tag in ("td", "th")]
+            if not cells:
+                continue
+            row = [self.grab_cell(c) for c in cells]
+            if all(c.tag == "th" for c in cells):
+                # header-ish row
+                in_thead = tr.getparent().tag == "thead"
+                (self.thead_rows if in_thead else self.header_candidates).append(row)
+            else:
+                self.data_rows.append(row)
+
+    @staticmethod
+    def grab_cell(cell):
+        text_norm = normalize_cell_text(cell.text_content())
+        # serialise the whole cell in one native call, then drop the <td>/<th>
+        # wrapper (">" inside attribute values is escaped, so the first ">"
+        # closes the opening tag)
+        outer = lxml_html.tostring(cell, encoding="unicode", with_tail=False)
+        inner = outer[outer.index(">") + 1:-len(f"</{cell.tag}>")]
+        # Text is escaped in the serialised HTML, so a cell without "<a" in it
+        # has no anchors and needs no third walk of its subtree
+        links = [
+            {"text": clean_text(" ".join(a.text_content().split())), "href": clean_text(a.get("href"))}
+            for a in cell.iter("a")
+            if a.get("href") is not None
+        ] if "<a" in inner else []
+        return (text_norm, clean_html(inner), links)
+
+
+def parser_backend() -> str:
+    """"lxml" when available, unless HTML_PARSER=html.parser; else "html.parser"."""
+    forced = os.environ.get("HTML_PARSER", "").strip().lower()
+    if lxml_html is not None and forced != "html.parser":
+        return "lxml"
+    return "html.parser"
+
+def make_grabber():
+    return LxmlTableGrabber() if parser_backend() == "lxml" else TableGrabber()
+
+
 # ---------- Helpers for conversion ----------
 
 def normalize_headers(headers: list[str]) -> list[str]:
     out = []
     for h in headers:
-        hh = re.sub(r"\s+", " ", (h or "")).strip()
+        hh = " ".join((h or "").split())
         if hh.lower() == "aural ui" or hh == "Aural UI":
             hh = "AURAL UI"
         out.append(hh)
     return out
 
+def emit_rich_cells() -> bool:
+    return os.environ.get("EMIT_RICH_CELLS", "1").strip() != "0"
+
 def extract_year(s: str) -> str:
-    m = re.search(r"\b(?:19|20)\d{2}\b", s or "")
+    m = _YEAR_RE.search(s or "")
     return m.group(0) if m else ""
 
 def choose_header(thead_rows, header_candidates) -> list[str]:
@@ -225,35 +410,35 @@ def choose_header(thead_rows, header_candidates) -> list[str]:
     Search order: <thead> rows first, then other header-candidate rows.
     If none match exactly, accept any row that contains 'element' as a substring.
     """
-    def rows_to_text(rows):
-        return [[cell[0] for cell in row] for row in rows]
+    def normalized(rows):
+        return [normalize_headers([cell[0] for cell in row]) for row in rows]
 
-    # 1) thead rows
-    for row in rows_to_text(thead_rows):
-        norm = normalize_headers(row)
-        if any(h.lower() == "element" for h in norm):
-            return norm
+    # Normalise each row once; the passes below only scan the results
+    # (<thead> rows come first, then the other header-candidate rows)
+    rows = normalized(thead_rows) + normalized(header_candidates)
 
-    # 2) header-candidate rows
-    for row in rows_to_text(header_candidates):
-        norm = normalize_headers(row)
+    # 1) thead rows, then 2) header-candidate rows
+    for norm in rows:
         if any(h.lower() == "element" for h in norm):
             return norm
 
     # 3) soft fallback: contains "element"
-    for row in rows_to_text(thead_rows + header_candidates):
-        norm = normalize_headers(row)
+    for norm in rows:
         if any("element" in h.lower() for h in norm):
             return norm
 
     return []
 
 
-def convert(path: Path, sr_name: str) -> dict:
-    grab = TableGrabber()
-    grab.feed(path.read_text(encoding="utf-8", errors="ignore"))
+def convert(path: Path, sr_name: str, grab=None) -> dict:
+    """Pass `grab` to reuse a grabber across files; it is reset first."""
+    if grab is None:
+        grab = make_grabber()
+    else:
+        grab.reset()
+    grab.feed_file(path)
 
-    caption = clean_text(re.sub(r"\s+", " ", unescape("".join(grab.caption_text)).strip()))
+    caption = clean_text(_WS_RE.sub(" ", "".join(grab.caption_text)).strip())
     caption_links = [clean_text(u) for u in grab.caption_links]
 
     headers = choose_header(grab.thead_rows, grab.header_candidates)
@@ -261,32 +446,44 @@ def convert(path: Path, sr_name: str) -> dict:
         die(f"{sr_name}: could not find a header row containing 'Element' in {path.name}.")
 
     print(f"{sr_name}: headers = {headers}")
+    # Every row dict is keyed by these; share one string object per header
+    headers = [sys.intern(h) for h in headers]
 
+    rich = emit_rich_cells()
+    # Rows are kept only if their "Element" cell is non-empty; without that
+    # column none of them would show in the lookup
+    elem_idx = headers.index("Element") if "Element" in headers else None
+
+    n = len(headers)
     rows_out = []
     for row in grab.data_rows:
-        # align to headers (pad/truncate)
-        cells = row[:len(headers)] + [("", "", [])] * max(0, len(headers) - len(row))
-
-        obj = {}
-        html_map = {}
-        links_map = {}
-        for i, h in enumerate(headers):
-            txt, html, lks = cells[i]
-            obj[h] = clean_text(txt)
-            if html.strip():
-                html_map[h] = clean_html(html)
-            if lks:
-                links_map[h] = [{"text": clean_text(L.get("text", "")), "href": clean_text(L.get("href", ""))} for L in lks]
-
-        if html_map:
-            obj["_html"] = html_map
-        if links_map:
-            obj["_links"] = links_map
-
-        # Skip rows with empty Element (these won't show in the lookup)
-        if not obj.get("Element", "").strip():
+        # align to headers (pad/truncate); most rows already match
+        if len(row) == n:
+            cells = row
+        elif len(row) > n:
+            cells = row[:n]
+        else:
+            cells = row + [("", "", [])] * (n - len(row))
+
+        # Skip rows with empty Element before building anything for them
+        if elem_idx is None or not cells[elem_idx][0].strip():
             continue
 
+        # cell strings were already sanitised by the grabber; split the
+        # (text, html, links) tuples into columns once
+        texts, htmls, links = zip(*cells)
+        obj = dict(zip(headers, texts))
+
+        if rich:
+            html_map = {h: v for h, v in zip(headers, htmls) if v.strip()}
+            # grabbers already emit {text, href} in output order
+            links_map = {h: v for h, v in zip(headers, links) if v}
+
+            if html_map:
+                obj["_html"] = html_map
+            if links_map:
+                obj["_links"] = links_map
+
         rows_out.append(obj)
 
     return {
@@ -298,39 +495,172 @@ def convert(path: Path, sr_name: str) -> dict:
     }
 
 
+def _convert_one(task: tuple[Path, str]) -> dict:
+    path, sr_name = task
+    return convert(path, sr_name)
+
+
+def convert_tasks(tasks: list[tuple[Path, str]]) -> list[dict]:
+    workers = min(len(tasks), os.cpu_count() or 1)
+    if workers <= 1:
+        grab = make_grabber()
+        return [convert(p, name, grab) for p, name in tasks]
+    # Each file parses independently and the work is CPU-bound, so use
+    # processes rather than threads; ex.map keeps the input order.
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_convert_one, tasks))
+
+
 def build_bundle(paths: list[Path]) -> list[dict]:
-    # Stable display names for the first column
-    mapping = {
-        "jaws.html": "JAWS",
-        "nvda.html": "NVDA",
-        "talkback-android.html": "TalkBack on Android",
-        "vo-mac.html": "VoiceOver on Mac",
-        "vo-ios.html": "VoiceOver on iOS",
-    }
-    out = []
-    for p in paths:
-        name = mapping.get(p.name.lower(), p.stem)
-        out.append(convert(p, name))
-    return out
+    tasks = [(p, _SR_NAME_MAPPING.get(p.name.lower(), p.stem)) for p in paths]
+    cache_path = get_env_cache_path()
+    if cache_path is None:
+        return convert_tasks(tasks)
+
+    cache = load_cache(cache_path)
+    salt = cache_salt()
+    keys = [section_cache_key(p, name, salt) for p, name in tasks]
+    missing = [(t, k) for t, k in zip(tasks, keys) if k not in cache]
+    for (p, name), k in zip(tasks, keys):
+        if k in cache:
+            print(f"{name}: {p.name} unchanged; using cached section")
+    if missing:
+        fresh = convert_tasks([t for t, _ in missing])
+        cache.update((k, sec) for (_, k), sec in zip(missing, fresh))
+
+    # Only keep entries for the current inputs so the file doesn't grow
+    save_cache(cache_path, {k: cache[k] for k in keys})
+    return [cache[k] for k in keys]
+
+
+# ---------- Section cache ----------
+
+def get_env_cache_path() -> Path | None:
+    val = os.environ.get("BUNDLE_CACHE", "").strip()
+    return Path(val) if val else None
+
+def cache_salt() -> bytes:
+    """Everything besides the source bytes that shapes a parsed section."""
+    backend = parser_backend()
+    if backend == "lxml":
+        # lxml/libxml2 upgrades change how _html is serialised
+        backend += f" {lxml.__version__} libxml2 {lxml_etree.LIBXML_VERSION}"
+    else:
+        # html.parser's tokenising shifts between CPython patch releases
+        backend += f" {platform.python_version()}"
+    settings = f"|{backend}|{emit_rich_cells()}|"
+    return Path(__file__).read_bytes() + settings.encode("utf-8")
+
+def section_cache_key(path: Path, sr_name: str, salt: bytes) -> str:
+    h = hashlib.sha256(path.read_bytes())
+    h.update(salt)
+    h.update(sr_name.encode("utf-8"))
+    return h.hexdigest()
+
+def load_cache(path: Path) -> dict:
+    try:
+        cache = (orjson.loads if orjson is not None else json.loads)(path.read_bytes())
+    except (OSError, ValueError):
+        # missing or unreadable cache: start afresh
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    # stale/hand-edited entries that aren't sections are simply re-parsed
+    return {k: sec for k, sec in cache.items() if isinstance(sec, dict)}
+
+def save_cache(path: Path, cache: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_file(path, json_bytes(cache))
+
+
+def json_bytes(obj, pretty: bool = False) -> bytes:
+    """UTF-8 JSON: compact, or indented by 2 for the sibling diff file."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    # The bundle is a tree of plain dicts/lists/strings, so skip the cycle check
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2, check_circular=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), check_circular=False).encode("utf-8")
+
+
+def script_safe(payload: bytes) -> bytes:
+    # Avoid closing the script tag accidentally
+    return payload.replace(b"</", b"<\\/")
+
 
+def find_data_script(template: bytes) -> tuple[int, int] | None:
+    """
+    Locate the JSON inside <script id="data" ...>…</script> (or id="html-support-data").
+    Returns the (start, end) span of the payload, surrounding whitespace
+    excluded, or None if there is no such block. Tags match in any case:
 
-def inject_json(template_html: str, data: list[dict]) -> str:
-    # Replace JSON inside <script id="data" ...>…</script> (or id="html-support-data")
-    rx = re.compile(
-        r'(<script[^>]*id=["\'](?:data|html-support-data)["\'][^>]*>\s*)([\s\S]*?)(\s*</script>)',
-        re.IGNORECASE,
-    )
-    m = rx.search(template_html)
+    >>> t = b'<script id="data">[]</SCRIPT><script>app()</script>'
+    >>> s, e = find_data_script(t); t[s:e]
+    b'[]'
+    """
+    m = _DATA_SCRIPT_OPEN_RE.search(template)
     if not m:
-        die('Could not find a <script id="data" type="application/json">…</script> block in the template.')
+        return None
+    start = m.end()
+    close = _SCRIPT_CLOSE_RE.search(template, start)
+    if close is None:
+        return None
+    end = close.start()
+    while start < end and template[start:start + 1].isspace():
+        start += 1
+    while end > start and template[end - 1:end].isspace():
+        end -= 1
+    return start, end
+
+
+def split_template(template: bytes) -> tuple[memoryview, memoryview]:
+    """
+    (prefix, suffix) around the payload slot, as views rather than copies.
+    A /*__DATA__*/ placeholder is just the data script's payload, so it is
+    replaced like real JSON; the same text elsewhere is left alone:
 
-    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
-    # Avoid closing the script tag accidentally
-    payload = payload.replace("</", "<\\/")
+    >>> t = b'<script id="data">/*__DATA__*/</script><script>/*__DATA__*/</script>'
+    >>> p, s = split_template(t); bytes(s)
+    b'</script><script>/*__DATA__*/</script>'
+    """
+    span = find_data_script(template)
+    if span is None:
+        die('Could not find a <script id="data" type="application/json">…</script> block in the template.')
+    s, e = span
+    view = memoryview(template)
+    return view[:s], view[e:]
 
-    # IMPORTANT: use a function so backslashes in `payload` are NOT interpreted by re.sub
-    return rx.sub(lambda m: m.group(1) + payload + m.group(3), template_html)
 
+def write_file(path: Path, *chunks) -> None:
+    """
+    Write the bytes-like `chunks` in order straight to the fd, without the
+    buffered-writer layer and without joining them first.
+    """
+    # O_BINARY (Windows only) stops the CRT translating \n to \r\n
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o666)
+    try:
+        for chunk in chunks:
+            view = memoryview(chunk)
+            while view:
+                # os.write may write less than asked for
+                view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def write_outputs(files: list[tuple[Path, tuple]]) -> None:
+    """
+    Write each (path, chunks) pair; large outputs are written concurrently.
+    """
+    if sum(len(c) for _, chunks in files for c in chunks) < _PARALLEL_WRITE_MIN:
+        for path, chunks in files:
+            write_file(path, *chunks)
+        return
+    # I/O-bound: the GIL is released during the write syscalls
+    with ThreadPoolExecutor(max_workers=len(files)) as ex:
+        for f in [ex.submit(write_file, path, *chunks) for path, chunks in files]:
+            f.result()
 
 
 def validate_for_lookup(data: list[dict]) -> None:
@@ -358,13 +688,25 @@ def main():
     bundle = build_bundle(inputs)
     validate_for_lookup(bundle)
 
-    merged = inject_json(template.read_text(encoding="utf-8"), bundle)
-    out_html.write_text(merged, encoding="utf-8")
-    print(f"Wrote HTML: {out_html}")
+    # Serialise once; the compact form feeds the template (and the sibling
+    # JSON too when pretty-printing is switched off)
+    compact = json_bytes(bundle)
+    # Template and payload stay UTF-8 bytes from disk read to disk write; the
+    # HTML goes out as prefix/payload/suffix without a full-document join
+    prefix, suffix = split_template(template.read_bytes())
 
     # Also emit a sibling JSON file for diffing in PRs/Actions artifacts
     out_json = out_html.with_suffix(".json")
-    out_json.write_text(json.dumps(bundle, ensure_ascii=False, indent=2), encoding="utf-8")
+    if os.environ.get("PRETTY_JSON", "1").strip() == "0":
+        sibling = compact
+    else:
+        sibling = json_bytes(bundle, pretty=True)
+
+    write_outputs([
+        (out_html, (prefix, script_safe(compact), suffix)),
+        (out_json, (sibling,)),
+    ])
+    print(f"Wrote HTML: {out_html}")
     print(f"Wrote JSON: {out_json}")
 
 